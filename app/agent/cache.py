@@ -0,0 +1,22 @@
+from collections.abc import Callable
+from threading import RLock
+
+
+class VersionedResponseCache:
+    """Serialized payloads keyed by agent state version; any version bump invalidates everything."""
+
+    def __init__(self):
+        self.lock = RLock()
+        self.version = -1
+        self.entries: dict[str, bytes] = {}
+
+    def get_or_build(self, version: int, key: str, build: Callable[[], bytes]) -> bytes:
+        with self.lock:
+            if version != self.version:
+                self.version = version
+                self.entries.clear()
+            payload = self.entries.get(key)
+            if payload is None:
+                payload = build()
+                self.entries[key] = payload
+            return payload
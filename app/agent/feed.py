@@ -0,0 +1,112 @@
+from collections import deque
+from collections.abc import Callable
+from datetime import datetime, timezone
+from enum import Enum
+from threading import RLock
+from typing import Any
+
+from pydantic import BaseModel, Field
+
+
+class IncidentEventType(str, Enum):
+    OPENED = "opened"
+    UPDATED = "updated"
+    STATUS_CHANGED = "status_changed"
+    ACTION_EXECUTED = "action_executed"
+    RESOLVED = "resolved"
+    RESYNC = "resync"
+
+
+class IncidentEvent(BaseModel):
+    seq: int
+    type: IncidentEventType
+    incident_id: str | None = None
+    service: str | None = None
+    data: dict[str, Any] = Field(default_factory=dict)
+    timestamp: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+class FeedSubscription:
+    """Bounded per-subscriber buffer; overflowing drops the backlog and asks the client to resync."""
+
+    def __init__(self, max_pending: int, notify: Callable[[], None] | None = None):
+        self.max_pending = max_pending
+        self.notify = notify
+        self.lock = RLock()
+        self.pending: deque[IncidentEvent] = deque()
+        self.needs_resync = False
+        self.last_seq = 0
+
+    def push(self, event: IncidentEvent) -> None:
+        with self.lock:
+            if self.needs_resync:
+                self.last_seq = event.seq
+            elif len(self.pending) >= self.max_pending:
+                self.pending.clear()
+                self.needs_resync = True
+                self.last_seq = event.seq
+            else:
+                self.pending.append(event)
+        if self.notify is not None:
+            self.notify()
+
+    def drain(self) -> list[IncidentEvent]:
+        with self.lock:
+            if self.needs_resync:
+                self.needs_resync = False
+                return [IncidentEvent(seq=self.last_seq, type=IncidentEventType.RESYNC)]
+            events = list(self.pending)
+            self.pending.clear()
+            return events
+
+
+class IncidentFeed:
+    def __init__(self, history_size: int = 1000, subscriber_buffer: int = 256):
+        self.lock = RLock()
+        self.seq = 0
+        self.history: deque[IncidentEvent] = deque(maxlen=history_size)
+        self.subscriber_buffer = subscriber_buffer
+        self.subscribers: list[FeedSubscription] = []
+
+    def publish(
+        self,
+        event_type: IncidentEventType,
+        incident_id: str,
+        service: str,
+        data: dict[str, Any] | None = None,
+        timestamp: datetime | None = None,
+    ) -> IncidentEvent:
+        with self.lock:
+            self.seq += 1
+            event = IncidentEvent(
+                seq=self.seq,
+                type=event_type,
+                incident_id=incident_id,
+                service=service,
+                data=data or {},
+                timestamp=timestamp or datetime.now(timezone.utc),
+            )
+            self.history.append(event)
+            for subscription in self.subscribers:
+                subscription.push(event)
+            return event
+
+    def subscribe(self, since: int | None = None, notify: Callable[[], None] | None = None) -> FeedSubscription:
+        with self.lock:
+            subscription = FeedSubscription(self.subscriber_buffer, notify)
+            if since is not None and since != self.seq:
+                oldest = self.history[0].seq if self.history else self.seq + 1
+                backlog = [event for event in self.history if event.seq > since]
+                # A cursor ahead of the feed comes from a previous process and cannot be resumed.
+                if since > self.seq or since < oldest - 1 or len(backlog) > subscription.max_pending:
+                    subscription.needs_resync = True
+                    subscription.last_seq = self.seq
+                else:
+                    subscription.pending.extend(backlog)
+            self.subscribers.append(subscription)
+            return subscription
+
+    def unsubscribe(self, subscription: FeedSubscription) -> None:
+        with self.lock:
+            if subscription in self.subscribers:
+                self.subscribers.remove(subscription)
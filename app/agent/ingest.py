@@ -0,0 +1,97 @@
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime
+from threading import Lock
+from typing import Literal
+
+from app.config import Settings
+
+IngestStatus = Literal["accepted", "duplicate", "stale", "throttled"]
+
+
+@dataclass
+class IngestDecision:
+    status: IngestStatus
+    reason: str
+    retry_after_seconds: float | None = None
+
+    @property
+    def accepted(self) -> bool:
+        return self.status == "accepted"
+
+
+@dataclass
+class TokenBucket:
+    tokens: float
+    updated_at: float
+
+
+class IngestGate:
+    """Drops duplicate and out-of-order events and sheds load per service before the agent loop runs."""
+
+    def __init__(self, settings: Settings, clock: Callable[[], float] = time.monotonic):
+        self.settings = settings
+        self.clock = clock
+        self.lock = Lock()
+
+        self.seen: OrderedDict[str, float] = OrderedDict()
+        self.latest_timestamps: dict[tuple[str, str], datetime] = {}
+        self.buckets: dict[str, TokenBucket] = {}
+
+    def admit(self, kind: str, service: str, key: str | None, timestamp: datetime) -> IngestDecision:
+        with self.lock:
+            now = self.clock()
+            # Events without a client-supplied identity skip dedup; only staleness and admission apply.
+            event_key = f"{kind}:{service}:{key}" if key is not None else None
+
+            if event_key is not None and self._is_duplicate(event_key, now):
+                return IngestDecision("duplicate", f"duplicate {kind} event for {service}")
+
+            latest = self.latest_timestamps.get((kind, service))
+            if latest is not None and timestamp < latest:
+                return IngestDecision("stale", f"{kind} event older than latest ({latest.isoformat()})")
+
+            retry_after = self._take_token(service, now)
+            if retry_after is not None:
+                return IngestDecision("throttled", f"ingest rate exceeded for {service}", retry_after)
+
+            if event_key is not None:
+                self._remember(event_key, now)
+            self.latest_timestamps[(kind, service)] = timestamp
+            return IngestDecision("accepted", "accepted")
+
+    def _is_duplicate(self, event_key: str, now: float) -> bool:
+        seen_at = self.seen.get(event_key)
+        if seen_at is None:
+            return False
+        if now - seen_at > self.settings.ingest_dedup_window_seconds:
+            del self.seen[event_key]
+            return False
+        self.seen.move_to_end(event_key)
+        return True
+
+    def _remember(self, event_key: str, now: float) -> None:
+        self.seen[event_key] = now
+        self.seen.move_to_end(event_key)
+        while len(self.seen) > self.settings.ingest_dedup_max_keys:
+            self.seen.popitem(last=False)
+
+    def _take_token(self, service: str, now: float) -> float | None:
+        rate = self.settings.ingest_rate_per_second
+        if rate <= 0:
+            return None
+
+        burst = max(float(self.settings.ingest_burst), 1.0)
+        bucket = self.buckets.get(service)
+        if bucket is None:
+            bucket = TokenBucket(tokens=burst, updated_at=now)
+            self.buckets[service] = bucket
+
+        bucket.tokens = min(burst, bucket.tokens + (now - bucket.updated_at) * rate)
+        bucket.updated_at = now
+        if bucket.tokens < 1.0:
+            return (1.0 - bucket.tokens) / rate
+        bucket.tokens -= 1.0
+        return None
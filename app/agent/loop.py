@@ -1,8 +1,14 @@
+import time
+from collections.abc import Callable
 from datetime import datetime, timedelta, timezone
 from threading import RLock
+from uuid import uuid4
 
+from app.agent.cache import VersionedResponseCache
 from app.agent.diagnosis import Diagnoser
 from app.agent.executor import ActionExecutor
+from app.agent.feed import IncidentEventType, IncidentFeed
+from app.agent.ingest import IngestDecision, IngestGate
 from app.agent.memory import IncidentMemory
 from app.agent.models import (
     ActionName,
@@ -15,17 +21,25 @@ from app.agent.models import (
 from app.agent.policy import SafetyPolicy
 from app.agent.verifier import Verifier
 from app.config import Settings
-from app.schemas import DeployEventIn, MetricEventIn
+from app.schemas import DeployEventIn, IncidentListResponse, MetricEventIn
 
 
 class SelfHealingAgent:
-    def __init__(self, settings: Settings):
+    def __init__(self, settings: Settings, clock: Callable[[], datetime] | None = None):
         self.settings = settings
+        self.clock = clock or (lambda: datetime.now(timezone.utc))
         self.lock = RLock()
 
         self.latest_metrics: dict[str, MetricSnapshot] = {}
         self.latest_deploys: dict[str, DeploySnapshot] = {}
         self.incidents: dict[str, Incident] = {}
+        # Distinguishes versions across restarts so ETags from a previous process never match.
+        self.epoch = uuid4().hex[:12]
+        self.version = 0
+
+        self.response_cache = VersionedResponseCache()
+        self.feed = IncidentFeed(settings.feed_history_size, settings.feed_subscriber_buffer)
+        self.ingest_gate = IngestGate(settings, time.monotonic if clock is None else lambda: self.clock().timestamp())
 
         self.diagnoser = Diagnoser()
         self.policy = SafetyPolicy(settings)
@@ -33,8 +47,17 @@ class SelfHealingAgent:
         self.verifier = Verifier(settings)
         self.memory = IncidentMemory(settings.memory_log_path)
 
+    def admit_deploy(self, event: DeployEventIn, idempotency_key: str | None = None) -> IngestDecision:
+        return self.ingest_gate.admit("deploy", event.service, _dedup_key(event, idempotency_key), event.timestamp)
+
+    def admit_metric(self, event: MetricEventIn, idempotency_key: str | None = None) -> IngestDecision:
+        return self.ingest_gate.admit("metric", event.service, _dedup_key(event, idempotency_key), event.timestamp)
+
     def ingest_deploy(self, event: DeployEventIn) -> list[str]:
         with self.lock:
+            current = self.latest_deploys.get(event.service)
+            if current is not None and event.timestamp < current.timestamp:
+                return []
             self.latest_deploys[event.service] = DeploySnapshot(
                 service=event.service,
                 environment=event.environment,
@@ -58,6 +81,9 @@ class SelfHealingAgent:
 
     def ingest_metric(self, event: MetricEventIn) -> list[str]:
         with self.lock:
+            current = self.latest_metrics.get(event.service)
+            if current is not None and event.timestamp < current.timestamp:
+                return []
             self.latest_metrics[event.service] = MetricSnapshot(
                 service=event.service,
                 environment=event.environment,
@@ -102,7 +128,7 @@ class SelfHealingAgent:
 
     def run_once(self, service: str | None = None) -> list[Incident]:
         with self.lock:
-            now = datetime.now(timezone.utc)
+            now = self.clock()
             incidents = [
                 incident
                 for incident in self.incidents.values()
@@ -112,7 +138,7 @@ class SelfHealingAgent:
             processed: list[Incident] = []
 
             for incident in incidents:
-                incident.status = IncidentStatus.MITIGATING
+                self._set_status(incident, IncidentStatus.MITIGATING)
                 incident.updated_at = now
 
                 metric = self.latest_metrics.get(incident.service)
@@ -134,7 +160,9 @@ class SelfHealingAgent:
                         continue
 
                     execution = self.executor.execute(incident, action)
+                    execution.timestamp = self.clock()
                     incident.executed_actions.append(execution)
+                    self._publish(IncidentEventType.ACTION_EXECUTED, incident, execution.model_dump(mode="json"))
 
                     if execution.success and self.settings.dry_run:
                         self._simulate_metric_shift(incident.service, action)
@@ -142,20 +170,19 @@ class SelfHealingAgent:
                     current_metric = self.latest_metrics.get(incident.service)
                     recovered, verification_note = self.verifier.verify(incident, current_metric)
                     if recovered:
-                        incident.status = IncidentStatus.RESOLVED
                         break
 
-                if not recovered:
-                    incident.status = IncidentStatus.ESCALATED
-
                 if policy_reasons:
                     incident.metadata["policy_reasons"] = policy_reasons
                 incident.metadata["verification"] = verification_note
-                incident.updated_at = datetime.now(timezone.utc)
+                incident.updated_at = self.clock()
+                self._set_status(incident, IncidentStatus.RESOLVED if recovered else IncidentStatus.ESCALATED)
 
                 self.memory.write(incident)
                 processed.append(incident)
 
+            if processed:
+                self._bump_version()
             return processed
 
     def list_incidents(self) -> list[Incident]:
@@ -166,6 +193,29 @@ class SelfHealingAgent:
         with self.lock:
             return self.incidents.get(incident_id)
 
+    def list_incidents_json(self) -> tuple[int, bytes]:
+        with self.lock:
+            version = self.version
+            payload = self.response_cache.get_or_build(
+                version,
+                "incidents",
+                lambda: IncidentListResponse(incidents=self.list_incidents()).model_dump_json().encode("utf-8"),
+            )
+            return version, payload
+
+    def get_incident_json(self, incident_id: str) -> tuple[int, bytes | None]:
+        with self.lock:
+            version = self.version
+            incident = self.incidents.get(incident_id)
+            if incident is None:
+                return version, None
+            payload = self.response_cache.get_or_build(
+                version,
+                f"incident:{incident_id}",
+                lambda: incident.model_dump_json().encode("utf-8"),
+            )
+            return version, payload
+
     def memory_tail(self, limit: int = 20) -> list[dict]:
         return self.memory.tail(limit)
 
@@ -182,11 +232,14 @@ class SelfHealingAgent:
         if existing:
             existing.summary = summary
             existing.severity = severity
-            existing.updated_at = datetime.now(timezone.utc)
+            existing.updated_at = self.clock()
             if metadata:
                 existing.metadata.update(metadata)
+            self._bump_version()
+            self._publish(IncidentEventType.UPDATED, existing, {"summary": summary, "severity": severity})
             return existing
 
+        now = self.clock()
         incident = Incident(
             service=service,
             environment=environment,
@@ -194,10 +247,34 @@ class SelfHealingAgent:
             summary=summary,
             severity=severity,
             metadata=metadata or {},
+            opened_at=now,
+            updated_at=now,
         )
         self.incidents[incident.id] = incident
+        self._bump_version()
+        self._publish(IncidentEventType.OPENED, incident, incident.model_dump(mode="json"))
         return incident
 
+    def _bump_version(self) -> None:
+        self.version += 1
+
+    def _set_status(self, incident: Incident, status: IncidentStatus) -> None:
+        previous = incident.status
+        if previous == status:
+            return
+        incident.status = status
+        if status == IncidentStatus.RESOLVED:
+            self._publish(
+                IncidentEventType.RESOLVED,
+                incident,
+                {"previous": previous.value, "verification": incident.metadata.get("verification")},
+            )
+            return
+        self._publish(IncidentEventType.STATUS_CHANGED, incident, {"previous": previous.value, "status": status.value})
+
+    def _publish(self, event_type: IncidentEventType, incident: Incident, data: dict) -> None:
+        self.feed.publish(event_type, incident.id, incident.service, data, timestamp=self.clock())
+
     def _find_open_incident(self, service: str, trigger: IncidentTrigger) -> Incident | None:
         for incident in self.incidents.values():
             if incident.service != service:
@@ -241,3 +318,14 @@ class SelfHealingAgent:
 
         if action == ActionName.CLEAR_QUEUE:
             metric.p95_latency_ms = int(metric.p95_latency_ms * 0.75)
+
+
+def _dedup_key(event: DeployEventIn | MetricEventIn, idempotency_key: str | None = None) -> str | None:
+    if event.event_id:
+        return f"id:{event.event_id}"
+    if idempotency_key:
+        return f"id:{idempotency_key}"
+    # Without a client timestamp, identical values may be a genuine repeat (e.g. recovery, rollback).
+    if "timestamp" in event.model_fields_set:
+        return event.model_dump_json(exclude_unset=True)
+    return None
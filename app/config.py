@@ -20,6 +20,14 @@ class Settings(BaseSettings):
 
     memory_log_path: str = ".agent/memory.jsonl"
 
+    feed_history_size: int = 1000
+    feed_subscriber_buffer: int = 256
+
+    ingest_dedup_window_seconds: float = 300.0
+    ingest_dedup_max_keys: int = 10000
+    ingest_rate_per_second: float = 20.0
+    ingest_burst: int = 40
+
     @property
     def enabled_runbook_set(self) -> set[str]:
         return {item.strip() for item in self.enabled_runbooks.split(",") if item.strip()}
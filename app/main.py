@@ -1,6 +1,12 @@
-from fastapi import FastAPI, HTTPException, Query
+import asyncio
+import math
 
+from fastapi import FastAPI, Header, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+
+from app.agent.ingest import IngestDecision
 from app.agent.loop import SelfHealingAgent
+from app.agent.models import Incident
 from app.config import get_settings
 from app.schemas import DeployEventIn, IncidentListResponse, IngestResponse, MetricEventIn, RunOnceResponse
 
@@ -9,6 +15,8 @@ agent = SelfHealingAgent(settings)
 
 app = FastAPI(title=settings.app_name, version="0.1.0")
 
+FEED_KEEPALIVE_SECONDS = 15.0
+
 
 @app.get("/health")
 def health() -> dict[str, str]:
@@ -16,14 +24,20 @@ def health() -> dict[str, str]:
 
 
 @app.post("/events/deploy", response_model=IngestResponse)
-def ingest_deploy(event: DeployEventIn) -> IngestResponse:
+def ingest_deploy(event: DeployEventIn, idempotency_key: str | None = Header(default=None)) -> IngestResponse:
+    decision = agent.admit_deploy(event, idempotency_key)
+    if not decision.accepted:
+        return _rejected(decision)
     incident_ids = agent.ingest_deploy(event)
     processed = agent.run_once(service=event.service)
     return IngestResponse(incident_ids=incident_ids, processed_incidents=processed)
 
 
 @app.post("/events/metric", response_model=IngestResponse)
-def ingest_metric(event: MetricEventIn) -> IngestResponse:
+def ingest_metric(event: MetricEventIn, idempotency_key: str | None = Header(default=None)) -> IngestResponse:
+    decision = agent.admit_metric(event, idempotency_key)
+    if not decision.accepted:
+        return _rejected(decision)
     incident_ids = agent.ingest_metric(event)
     processed = agent.run_once(service=event.service)
     return IngestResponse(incident_ids=incident_ids, processed_incidents=processed)
@@ -36,18 +50,97 @@ def run_once(service: str | None = Query(default=None)) -> RunOnceResponse:
 
 
 @app.get("/incidents", response_model=IncidentListResponse)
-def list_incidents() -> IncidentListResponse:
-    return IncidentListResponse(incidents=agent.list_incidents())
-
-
-@app.get("/incidents/{incident_id}")
-def get_incident(incident_id: str):
-    incident = agent.get_incident(incident_id)
-    if incident is None:
+def list_incidents(if_none_match: str | None = Header(default=None)) -> Response:
+    version = agent.version
+    if _etag_matches(if_none_match, version):
+        return _not_modified(version)
+    version, payload = agent.list_incidents_json()
+    return _json_response(payload, version)
+
+
+@app.get("/incidents/stream")
+async def stream_incidents(
+    request: Request,
+    since: int | None = Query(default=None, ge=0),
+    last_event_id: str | None = Header(default=None),
+) -> StreamingResponse:
+    # EventSource reconnects to the original URL, so Last-Event-ID must win over ?since=.
+    if last_event_id and last_event_id.isdigit():
+        since = int(last_event_id)
+
+    return StreamingResponse(
+        _feed_events(request, since),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"},
+    )
+
+
+@app.get("/incidents/{incident_id}", response_model=Incident)
+def get_incident(incident_id: str, if_none_match: str | None = Header(default=None)) -> Response:
+    version = agent.version
+    if _etag_matches(if_none_match, version) and agent.get_incident(incident_id) is not None:
+        return _not_modified(version)
+    version, payload = agent.get_incident_json(incident_id)
+    if payload is None:
         raise HTTPException(status_code=404, detail="incident not found")
-    return incident
+    return _json_response(payload, version)
 
 
 @app.get("/memory")
 def memory(limit: int = Query(default=20, ge=1, le=500)) -> dict[str, list[dict]]:
     return {"items": agent.memory_tail(limit)}
+
+
+def _rejected(decision: IngestDecision) -> IngestResponse:
+    if decision.status == "throttled":
+        retry_after = math.ceil(decision.retry_after_seconds or 1.0)
+        raise HTTPException(status_code=429, detail=decision.reason, headers={"Retry-After": str(retry_after)})
+    return IngestResponse(accepted=False, reason=decision.reason)
+
+
+async def _feed_events(request: Request, since: int | None):
+    loop = asyncio.get_running_loop()
+    wakeup = asyncio.Event()
+
+    def notify() -> None:
+        if not loop.is_closed():
+            loop.call_soon_threadsafe(wakeup.set)
+
+    # Subscribe only once the response is iterated so the finally below always unsubscribes.
+    subscription = agent.feed.subscribe(since=since, notify=notify)
+    try:
+        while not await request.is_disconnected():
+            wakeup.clear()
+            for event in subscription.drain():
+                yield f"id: {event.seq}\nevent: {event.type.value}\ndata: {event.model_dump_json()}\n\n"
+            try:
+                await asyncio.wait_for(wakeup.wait(), timeout=FEED_KEEPALIVE_SECONDS)
+            except TimeoutError:
+                yield ": keep-alive\n\n"
+    finally:
+        agent.feed.unsubscribe(subscription)
+
+
+def _etag(version: int) -> str:
+    return f'"{agent.epoch}-{version}"'
+
+
+def _etag_matches(if_none_match: str | None, version: int) -> bool:
+    if not if_none_match:
+        return False
+    current = _etag(version)
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate in {"*", current}:
+            return True
+    return False
+
+
+def _not_modified(version: int) -> Response:
+    return Response(status_code=304, headers={"ETag": _etag(version)})
+
+
+def _json_response(payload: bytes, version: int) -> Response:
+    return Response(content=payload, media_type="application/json", headers={"ETag": _etag(version)})
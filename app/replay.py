@@ -0,0 +1,215 @@
+"""Replay recorded deploy/metric traces through the agent in virtual time, across settings variants."""
+
+import argparse
+import itertools
+import json
+import os
+import statistics
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from pydantic import ValidationError
+
+from app.agent.loop import SelfHealingAgent
+from app.agent.models import IncidentStatus, IncidentTrigger
+from app.config import Settings
+from app.schemas import DeployEventIn, MetricEventIn
+
+TraceEvent = DeployEventIn | MetricEventIn
+
+
+@dataclass
+class VariantResult:
+    name: str
+    overrides: dict[str, Any]
+    events_replayed: int = 0
+    events_dropped: int = 0
+    incidents: int = 0
+    resolved: int = 0
+    escalated: int = 0
+    actions_taken: int = 0
+    resolution_rate: float = 0.0
+    breach_episodes: int = 0
+    episodes_recovered: int = 0
+    mean_time_to_resolve_seconds: float | None = None
+    max_time_to_resolve_seconds: float | None = None
+    actions_by_name: dict[str, int] = field(default_factory=dict)
+
+
+class VirtualClock:
+    def __init__(self, start: datetime):
+        self.now = start
+
+    def __call__(self) -> datetime:
+        return self.now
+
+
+def load_trace(path: str | Path) -> list[TraceEvent]:
+    events: list[TraceEvent] = []
+    with Path(path).open(encoding="utf-8") as handle:
+        for line_number, line in enumerate(handle, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            kind = record.pop("type", None)
+            if kind == "deploy":
+                events.append(DeployEventIn.model_validate(record))
+            elif kind == "metric":
+                events.append(MetricEventIn.model_validate(record))
+            else:
+                raise ValueError(f"line {line_number}: unknown event type {kind!r}")
+    return events
+
+
+def replay(
+    events: list[TraceEvent],
+    settings: Settings,
+    name: str = "baseline",
+    overrides: dict[str, Any] | None = None,
+) -> VariantResult:
+    # Recorded history already happened, so live admission control must not throttle dense bursts.
+    settings = settings.model_copy(update={"dry_run": True, "memory_log_path": os.devnull, "ingest_rate_per_second": 0})
+    result = VariantResult(name=name, overrides=overrides or {})
+    if not events:
+        return result
+
+    clock = VirtualClock(events[0].timestamp)
+    agent = SelfHealingAgent(settings, clock=clock)
+    # Open breach episodes per (service, trigger): first breach sample -> resolving run or healthy sample.
+    episodes: dict[tuple[str, IncidentTrigger], datetime] = {}
+    resolve_times: list[float] = []
+
+    def close_episode(service: str, trigger: IncidentTrigger) -> None:
+        started_at = episodes.pop((service, trigger), None)
+        if started_at is not None:
+            resolve_times.append((clock.now - started_at).total_seconds())
+
+    # Events are replayed in recorded arrival order; virtual time never moves backwards.
+    for event in events:
+        clock.now = max(clock.now, event.timestamp)
+        if isinstance(event, DeployEventIn):
+            decision = agent.admit_deploy(event)
+            incident_ids = agent.ingest_deploy(event) if decision.accepted else []
+        else:
+            decision = agent.admit_metric(event)
+            incident_ids = agent.ingest_metric(event) if decision.accepted else []
+        if not decision.accepted:
+            result.events_dropped += 1
+            continue
+        result.events_replayed += 1
+
+        breached = {agent.incidents[incident_id].trigger for incident_id in incident_ids}
+        for trigger in breached:
+            if (event.service, trigger) not in episodes:
+                episodes[(event.service, trigger)] = clock.now
+                result.breach_episodes += 1
+        for trigger in _healthy_triggers(event) - breached:
+            close_episode(event.service, trigger)
+
+        for incident in agent.run_once(service=event.service):
+            if incident.status == IncidentStatus.RESOLVED:
+                close_episode(incident.service, incident.trigger)
+
+    result.episodes_recovered = len(resolve_times)
+    for incident in agent.incidents.values():
+        result.incidents += 1
+        result.actions_taken += len(incident.executed_actions)
+        for execution in incident.executed_actions:
+            action = execution.action.value
+            result.actions_by_name[action] = result.actions_by_name.get(action, 0) + 1
+        if incident.status == IncidentStatus.RESOLVED:
+            result.resolved += 1
+        elif incident.status == IncidentStatus.ESCALATED:
+            result.escalated += 1
+
+    if result.incidents:
+        result.resolution_rate = result.resolved / result.incidents
+    if resolve_times:
+        result.mean_time_to_resolve_seconds = statistics.fmean(resolve_times)
+        result.max_time_to_resolve_seconds = max(resolve_times)
+    return result
+
+
+def _healthy_triggers(event: TraceEvent) -> set[IncidentTrigger]:
+    if isinstance(event, DeployEventIn):
+        return {IncidentTrigger.DEPLOY_FAILED} if event.status == "succeeded" else set()
+    return {IncidentTrigger.HIGH_ERROR_RATE, IncidentTrigger.HIGH_LATENCY, IncidentTrigger.CRASH_LOOP}
+
+
+def expand_grid(axes: dict[str, list[Any]]) -> list[dict[str, Any]]:
+    if not axes:
+        return [{}]
+    keys = list(axes)
+    return [dict(zip(keys, values)) for values in itertools.product(*(axes[key] for key in keys))]
+
+
+def run_grid(
+    events: list[TraceEvent],
+    variants: list[dict[str, Any]],
+    base_settings: Settings | None = None,
+    max_workers: int | None = None,
+) -> list[VariantResult]:
+    base = (base_settings or Settings()).model_dump()
+    jobs = [(events, {**base, **overrides}, _variant_name(overrides), overrides) for overrides in variants]
+
+    if max_workers == 1 or len(jobs) <= 1:
+        return [_replay_job(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(_replay_job, jobs))
+
+
+def _replay_job(job: tuple[list[TraceEvent], dict[str, Any], str, dict[str, Any]]) -> VariantResult:
+    events, fields, name, overrides = job
+    return replay(events, Settings(_env_file=None, **fields), name=name, overrides=overrides)
+
+
+def _variant_name(overrides: dict[str, Any]) -> str:
+    if not overrides:
+        return "baseline"
+    return ",".join(f"{key}={value}" for key, value in overrides.items())
+
+
+def _parse_axis(spec: str) -> tuple[str, list[str]]:
+    key, separator, values = spec.partition("=")
+    if not separator or not values:
+        raise argparse.ArgumentTypeError(f"expected key=value[,value...], got {spec!r}")
+    key = key.strip()
+    if key not in Settings.model_fields:
+        raise argparse.ArgumentTypeError(f"unknown setting {key!r}")
+    # Runbook sets are themselves comma-separated, so variants are separated by '|'.
+    splitter = "|" if key == "enabled_runbooks" else ","
+    parsed = [value.strip() for value in values.split(splitter)]
+    for value in parsed:
+        try:
+            Settings(_env_file=None, **{key: value})
+        except ValidationError as exc:
+            raise argparse.ArgumentTypeError(f"invalid value {value!r} for {key}: {exc.errors()[0]['msg']}") from exc
+    return key, parsed
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Replay an NDJSON event trace against settings variants.")
+    parser.add_argument("trace", help="path to NDJSON trace of deploy/metric events")
+    parser.add_argument(
+        "--vary",
+        action="append",
+        default=[],
+        type=_parse_axis,
+        metavar="KEY=V1,V2",
+        help="setting to sweep; repeat to build a grid (enabled_runbooks variants are separated by '|')",
+    )
+    parser.add_argument("--workers", type=int, default=None, help="process pool size (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    events = load_trace(args.trace)
+    variants = expand_grid(dict(args.vary))
+    for result in run_grid(events, variants, max_workers=args.workers):
+        print(json.dumps(asdict(result), separators=(",", ":")))
+
+
+if __name__ == "__main__":
+    main()
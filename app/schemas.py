@@ -1,31 +1,44 @@
 from datetime import datetime, timezone
-from typing import Literal
+from typing import Annotated, Literal
 
-from pydantic import BaseModel, Field
+from pydantic import AfterValidator, BaseModel, Field
 
 from app.agent.models import Incident
 
 
+def _as_utc(value: datetime) -> datetime:
+    # Naive timestamps are treated as UTC so ingest ordering never compares naive and aware values.
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+UtcDatetime = Annotated[datetime, AfterValidator(_as_utc)]
+
+
 class DeployEventIn(BaseModel):
+    event_id: str | None = None
     service: str
     environment: str = "prod"
     version: str
     commit_sha: str
     status: Literal["started", "succeeded", "failed"]
-    timestamp: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    timestamp: UtcDatetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
 
 class MetricEventIn(BaseModel):
+    event_id: str | None = None
     service: str
     environment: str = "prod"
     error_rate: float = Field(ge=0.0, le=1.0)
     p95_latency_ms: int = Field(ge=0)
     crash_looping: bool = False
-    timestamp: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    timestamp: UtcDatetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
 
 class IngestResponse(BaseModel):
     accepted: bool = True
+    reason: str | None = None
     incident_ids: list[str] = Field(default_factory=list)
     processed_incidents: list[Incident] = Field(default_factory=list)
 
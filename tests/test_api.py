@@ -0,0 +1,189 @@
+import asyncio
+import json
+from datetime import datetime, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+
+from app import main
+from app.agent.loop import SelfHealingAgent
+from app.config import Settings
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch) -> TestClient:
+    settings = Settings(dry_run=True, memory_log_path=str(tmp_path / "memory.jsonl"))
+    monkeypatch.setattr(main, "agent", SelfHealingAgent(settings))
+    return TestClient(main.app)
+
+
+def _metric(service: str = "checkout-api", p95_latency_ms: int = 1200) -> dict:
+    return {
+        "service": service,
+        "environment": "prod",
+        "error_rate": 0.01,
+        "p95_latency_ms": p95_latency_ms,
+        "crash_looping": False,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def test_incident_list_returns_304_when_unchanged(client: TestClient) -> None:
+    client.post("/events/metric", json=_metric())
+
+    first = client.get("/incidents")
+    etag = first.headers["ETag"]
+    assert first.status_code == 200
+    assert len(first.json()["incidents"]) == 1
+
+    second = client.get("/incidents", headers={"If-None-Match": etag})
+    assert second.status_code == 304
+    assert second.headers["ETag"] == etag
+
+    client.post("/events/metric", json=_metric(service="payments-api"))
+    third = client.get("/incidents", headers={"If-None-Match": etag})
+    assert third.status_code == 200
+    assert third.headers["ETag"] != etag
+    assert len(third.json()["incidents"]) == 2
+
+
+def test_incident_detail_supports_etag(client: TestClient) -> None:
+    incident_id = client.post("/events/metric", json=_metric()).json()["incident_ids"][0]
+
+    first = client.get(f"/incidents/{incident_id}")
+    assert first.status_code == 200
+    assert first.json()["id"] == incident_id
+
+    second = client.get(f"/incidents/{incident_id}", headers={"If-None-Match": first.headers["ETag"]})
+    assert second.status_code == 304
+
+    missing = client.get("/incidents/unknown", headers={"If-None-Match": first.headers["ETag"]})
+    assert missing.status_code == 404
+
+
+def test_duplicate_metric_is_not_reprocessed(client: TestClient) -> None:
+    payload = _metric()
+
+    first = client.post("/events/metric", json=payload)
+    second = client.post("/events/metric", json=payload)
+
+    assert first.json()["accepted"] is True
+    assert second.status_code == 200
+    assert second.json()["accepted"] is False
+    assert second.json()["processed_incidents"] == []
+
+
+def test_ingest_overload_returns_429(client: TestClient) -> None:
+    main.agent.settings.ingest_rate_per_second = 1.0
+    main.agent.settings.ingest_burst = 1
+
+    assert client.post("/events/metric", json=_metric(p95_latency_ms=100)).status_code == 200
+    response = client.post("/events/metric", json=_metric(p95_latency_ms=101))
+
+    assert response.status_code == 429
+    assert "Retry-After" in response.headers
+
+
+def test_etag_from_previous_process_does_not_match(client: TestClient, tmp_path, monkeypatch) -> None:
+    client.post("/events/metric", json=_metric())
+    etag = client.get("/incidents").headers["ETag"]
+
+    settings = Settings(dry_run=True, memory_log_path=str(tmp_path / "restarted.jsonl"))
+    monkeypatch.setattr(main, "agent", SelfHealingAgent(settings))
+    client.post("/events/metric", json=_metric(service="payments-api"))
+
+    response = client.get("/incidents", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+@pytest.fixture
+def stream_client(client: TestClient, monkeypatch) -> TestClient:
+    # TestClient buffers the whole body, so disconnect after one drain/keep-alive cycle.
+    async def is_disconnected(self: Request) -> bool:
+        self.state.disconnect_checks = getattr(self.state, "disconnect_checks", 0) + 1
+        return self.state.disconnect_checks > 1
+
+    monkeypatch.setattr(main, "FEED_KEEPALIVE_SECONDS", 0.01)
+    monkeypatch.setattr(Request, "is_disconnected", is_disconnected)
+    return client
+
+
+def _sse_events(body: str) -> list[dict]:
+    events = []
+    for block in body.split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines() if line and not line.startswith(":"))
+        if fields:
+            events.append({"id": int(fields["id"]), "event": fields["event"], "data": json.loads(fields["data"])})
+    return events
+
+
+def test_stream_resumes_from_last_event_id(stream_client: TestClient) -> None:
+    stream_client.post("/events/metric", json=_metric(p95_latency_ms=1000))
+
+    response = stream_client.get("/incidents/stream?since=0", headers={"Last-Event-ID": "2"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = _sse_events(response.text)
+    assert [(event["id"], event["event"]) for event in events] == [(3, "action_executed"), (4, "resolved")]
+    assert events[0]["data"]["service"] == "checkout-api"
+    assert ": keep-alive" in response.text
+    assert main.agent.feed.subscribers == []
+
+
+def test_stream_since_query_and_stale_cursor(stream_client: TestClient) -> None:
+    stream_client.post("/events/metric", json=_metric(p95_latency_ms=1000))
+
+    resumed = _sse_events(stream_client.get("/incidents/stream?since=3").text)
+    assert [event["event"] for event in resumed] == ["resolved"]
+
+    stale = _sse_events(stream_client.get("/incidents/stream", headers={"Last-Event-ID": "500"}).text)
+    assert [(event["id"], event["event"]) for event in stale] == [(4, "resync")]
+
+
+def test_naive_and_aware_timestamps_are_comparable(client: TestClient) -> None:
+    aware = _metric(p95_latency_ms=100)
+    naive = {**_metric(p95_latency_ms=110), "timestamp": "2020-01-01T00:00:00"}
+
+    assert client.post("/events/metric", json=aware).status_code == 200
+    response = client.post("/events/metric", json=naive)
+
+    assert response.status_code == 200
+    assert response.json()["accepted"] is False
+
+
+def test_repeated_value_without_identity_is_accepted(client: TestClient) -> None:
+    healthy = {key: value for key, value in _metric(p95_latency_ms=100).items() if key != "timestamp"}
+    breach = {**healthy, "error_rate": 0.5}
+
+    for payload in (healthy, breach, healthy):
+        assert client.post("/events/metric", json=payload).json()["accepted"] is True
+    assert main.agent.latest_metrics["checkout-api"].error_rate == 0.01
+
+    release = {"service": "checkout-api", "version": "1", "commit_sha": "a1", "status": "succeeded"}
+    broken = {**release, "version": "2", "commit_sha": "b2", "status": "failed"}
+    for payload in (release, broken, release):
+        assert client.post("/events/deploy", json=payload).json()["accepted"] is True
+    assert main.agent.latest_deploys["checkout-api"].version == "1"
+
+
+def test_retry_with_event_id_or_idempotency_key_is_deduplicated(client: TestClient) -> None:
+    payload = {key: value for key, value in _metric().items() if key != "timestamp"}
+
+    assert client.post("/events/metric", json={**payload, "event_id": "evt-1"}).json()["accepted"] is True
+    retry = client.post("/events/metric", json={**payload, "event_id": "evt-1"}).json()
+    assert retry["accepted"] is False
+    assert "duplicate" in retry["reason"]
+
+    headers = {"Idempotency-Key": "retry-7"}
+    assert client.post("/events/metric", json=payload, headers=headers).json()["accepted"] is True
+    assert client.post("/events/metric", json=payload, headers=headers).json()["accepted"] is False
+
+
+def test_stream_response_does_not_subscribe_until_iterated(client: TestClient) -> None:
+    response = asyncio.run(main.stream_incidents(Request({"type": "http"}), since=None, last_event_id=None))
+
+    assert response.media_type == "text/event-stream"
+    assert main.agent.feed.subscribers == []
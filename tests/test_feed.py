@@ -0,0 +1,80 @@
+from datetime import datetime, timezone
+
+from app.agent.feed import IncidentEventType, IncidentFeed
+from app.agent.loop import SelfHealingAgent
+from app.config import Settings
+from app.schemas import MetricEventIn
+
+
+def test_agent_publishes_incident_lifecycle(tmp_path) -> None:
+    settings = Settings(dry_run=True, memory_log_path=str(tmp_path / "memory.jsonl"))
+    agent = SelfHealingAgent(settings)
+    subscription = agent.feed.subscribe()
+
+    agent.ingest_metric(
+        MetricEventIn(
+            service="checkout-api",
+            error_rate=0.01,
+            p95_latency_ms=1000,
+            timestamp=datetime.now(timezone.utc),
+        )
+    )
+    agent.run_once(service="checkout-api")
+
+    events = subscription.drain()
+    types = [event.type for event in events]
+    assert types == [
+        IncidentEventType.OPENED,
+        IncidentEventType.STATUS_CHANGED,
+        IncidentEventType.ACTION_EXECUTED,
+        IncidentEventType.RESOLVED,
+    ]
+    assert [event.seq for event in events] == [1, 2, 3, 4]
+    assert subscription.drain() == []
+
+
+def test_subscriber_resumes_from_sequence() -> None:
+    feed = IncidentFeed(history_size=10, subscriber_buffer=10)
+    for index in range(5):
+        feed.publish(IncidentEventType.UPDATED, f"inc-{index}", "checkout-api")
+
+    subscription = feed.subscribe(since=3)
+
+    assert [event.seq for event in subscription.drain()] == [4, 5]
+
+
+def test_resume_beyond_history_requests_resync() -> None:
+    feed = IncidentFeed(history_size=2, subscriber_buffer=10)
+    for index in range(5):
+        feed.publish(IncidentEventType.UPDATED, f"inc-{index}", "checkout-api")
+
+    subscription = feed.subscribe(since=1)
+    events = subscription.drain()
+
+    assert len(events) == 1
+    assert events[0].type == IncidentEventType.RESYNC
+    assert events[0].seq == 5
+
+
+def test_slow_subscriber_overflow_drops_backlog_and_resyncs() -> None:
+    feed = IncidentFeed(history_size=10, subscriber_buffer=2)
+    subscription = feed.subscribe()
+    for index in range(4):
+        feed.publish(IncidentEventType.UPDATED, f"inc-{index}", "checkout-api")
+
+    events = subscription.drain()
+    assert [event.type for event in events] == [IncidentEventType.RESYNC]
+    assert events[0].seq == 4
+
+    feed.publish(IncidentEventType.UPDATED, "inc-5", "checkout-api")
+    assert [event.seq for event in subscription.drain()] == [5]
+
+
+def test_resume_ahead_of_feed_requests_resync() -> None:
+    feed = IncidentFeed(history_size=10, subscriber_buffer=10)
+
+    subscription = feed.subscribe(since=500)
+    events = subscription.drain()
+
+    assert [event.type for event in events] == [IncidentEventType.RESYNC]
+    assert events[0].seq == 0
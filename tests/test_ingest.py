@@ -0,0 +1,69 @@
+from datetime import datetime, timedelta, timezone
+
+from app.agent.ingest import IngestGate
+from app.config import Settings
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_duplicate_dropped_within_window_only() -> None:
+    clock = FakeClock()
+    gate = IngestGate(Settings(ingest_dedup_window_seconds=60), clock=clock)
+    timestamp = datetime.now(timezone.utc)
+
+    assert gate.admit("metric", "checkout-api", "event-1", timestamp).accepted
+    assert gate.admit("metric", "checkout-api", "event-1", timestamp).status == "duplicate"
+
+    clock.now = 61.0
+    assert gate.admit("metric", "checkout-api", "event-1", timestamp).accepted
+
+
+def test_dedup_keys_are_bounded() -> None:
+    gate = IngestGate(Settings(ingest_dedup_max_keys=2), clock=FakeClock())
+    timestamp = datetime.now(timezone.utc)
+
+    for key in ("a", "b", "c"):
+        gate.admit("metric", "checkout-api", key, timestamp)
+
+    assert list(gate.seen) == ["metric:checkout-api:b", "metric:checkout-api:c"]
+    assert gate.admit("metric", "checkout-api", "a", timestamp).accepted
+
+
+def test_out_of_order_event_is_stale() -> None:
+    gate = IngestGate(Settings(), clock=FakeClock())
+    newer = datetime.now(timezone.utc)
+
+    assert gate.admit("metric", "checkout-api", "new", newer).accepted
+    assert gate.admit("metric", "checkout-api", "old", newer - timedelta(seconds=5)).status == "stale"
+    assert gate.admit("deploy", "checkout-api", "old", newer - timedelta(seconds=5)).accepted
+
+
+def test_token_bucket_throttles_per_service() -> None:
+    clock = FakeClock()
+    gate = IngestGate(Settings(ingest_rate_per_second=1.0, ingest_burst=2), clock=clock)
+    timestamp = datetime.now(timezone.utc)
+
+    assert gate.admit("metric", "checkout-api", "1", timestamp).accepted
+    assert gate.admit("metric", "checkout-api", "2", timestamp).accepted
+    throttled = gate.admit("metric", "checkout-api", "3", timestamp)
+    assert throttled.status == "throttled"
+    assert throttled.retry_after_seconds == 1.0
+    assert gate.admit("metric", "payments-api", "1", timestamp).accepted
+
+    clock.now = 1.0
+    assert gate.admit("metric", "checkout-api", "3", timestamp).accepted
+
+
+def test_events_without_identity_skip_dedup() -> None:
+    gate = IngestGate(Settings(), clock=FakeClock())
+    timestamp = datetime.now(timezone.utc)
+
+    assert gate.admit("metric", "checkout-api", None, timestamp).accepted
+    assert gate.admit("metric", "checkout-api", None, timestamp).accepted
+    assert not gate.seen
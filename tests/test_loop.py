@@ -1,4 +1,4 @@
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 
 from app.agent.loop import SelfHealingAgent
 from app.agent.models import IncidentStatus
@@ -53,3 +53,38 @@ def test_failed_deploy_escalates_when_high_risk_disabled() -> None:
     assert incident_ids
     assert processed
     assert processed[0].status == IncidentStatus.ESCALATED
+
+
+def test_out_of_order_metric_does_not_overwrite_latest(tmp_path) -> None:
+    settings = Settings(dry_run=True, memory_log_path=str(tmp_path / "memory.jsonl"))
+    agent = SelfHealingAgent(settings)
+    now = datetime.now(timezone.utc)
+
+    agent.ingest_metric(MetricEventIn(service="checkout-api", error_rate=0.01, p95_latency_ms=100, timestamp=now))
+    incident_ids = agent.ingest_metric(
+        MetricEventIn(
+            service="checkout-api",
+            error_rate=0.4,
+            p95_latency_ms=100,
+            timestamp=now - timedelta(seconds=30),
+        )
+    )
+
+    assert incident_ids == []
+    assert agent.latest_metrics["checkout-api"].error_rate == 0.01
+
+
+def test_injected_clock_stamps_incidents_actions_and_feed_events(tmp_path) -> None:
+    virtual_now = datetime(2026, 2, 20, 17, 0, tzinfo=timezone.utc)
+    settings = Settings(dry_run=True, memory_log_path=str(tmp_path / "memory.jsonl"))
+    agent = SelfHealingAgent(settings, clock=lambda: virtual_now)
+    subscription = agent.feed.subscribe()
+
+    agent.ingest_metric(
+        MetricEventIn(service="checkout-api", error_rate=0.01, p95_latency_ms=1000, timestamp=virtual_now)
+    )
+    incident = agent.run_once(service="checkout-api")[0]
+
+    assert incident.opened_at == incident.updated_at == virtual_now
+    assert [execution.timestamp for execution in incident.executed_actions] == [virtual_now]
+    assert {event.timestamp for event in subscription.drain()} == {virtual_now}
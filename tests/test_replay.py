@@ -0,0 +1,128 @@
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.agent.models import ActionName
+from app.config import Settings
+from app.replay import expand_grid, load_trace, main, replay, run_grid
+
+
+def _write_trace(tmp_path) -> str:
+    records = [
+        {
+            "type": "metric",
+            "service": "checkout-api",
+            "error_rate": 0.01,
+            "p95_latency_ms": 1000,
+            "timestamp": "2026-02-20T17:01:00Z",
+        },
+        {
+            "type": "metric",
+            "service": "checkout-api",
+            "error_rate": 0.01,
+            "p95_latency_ms": 1000,
+            "timestamp": "2026-02-20T17:01:00Z",
+        },
+        {
+            "type": "deploy",
+            "service": "payments-api",
+            "version": "1.2.0",
+            "commit_sha": "abc123",
+            "status": "failed",
+            "timestamp": "2026-02-20T17:02:00Z",
+        },
+    ]
+    return _write_records(tmp_path, records)
+
+
+def _write_records(tmp_path, records: list[dict]) -> str:
+    path = tmp_path / "trace.ndjson"
+    path.write_text("\n".join(json.dumps(record) for record in records) + "\n", encoding="utf-8")
+    return str(path)
+
+
+def test_replay_reports_actions_and_resolution(tmp_path) -> None:
+    events = load_trace(_write_trace(tmp_path))
+
+    result = replay(events, Settings(_env_file=None, allow_high_risk_actions=False))
+
+    assert result.events_replayed == 2
+    assert result.events_dropped == 1
+    assert result.incidents == 2
+    assert result.resolved == 1
+    assert result.escalated == 1
+    assert result.resolution_rate == 0.5
+    assert result.actions_by_name == {ActionName.SCALE_UP.value: 1}
+    assert result.breach_episodes == 2
+    assert result.episodes_recovered == 1
+
+
+def test_run_grid_evaluates_each_variant_in_process_pool(tmp_path) -> None:
+    events = load_trace(_write_trace(tmp_path))
+    variants = expand_grid({"allow_high_risk_actions": [False, True], "max_actions_per_incident": [1, 2]})
+
+    results = run_grid(events, variants, base_settings=Settings(_env_file=None), max_workers=2)
+
+    assert [result.overrides for result in results] == variants
+    by_name = {result.name: result for result in results}
+    assert by_name["allow_high_risk_actions=False,max_actions_per_incident=1"].resolved == 1
+    assert by_name["allow_high_risk_actions=True,max_actions_per_incident=1"].resolved == 2
+
+
+def _latency(p95_latency_ms: int, timestamp: str) -> dict:
+    return {
+        "type": "metric",
+        "service": "checkout-api",
+        "error_rate": 0.01,
+        "p95_latency_ms": p95_latency_ms,
+        "timestamp": timestamp,
+    }
+
+
+def test_time_to_resolve_spans_trace_events(tmp_path) -> None:
+    trace = _write_records(
+        tmp_path,
+        [
+            _latency(2000, "2026-02-20T17:00:00Z"),
+            _latency(1800, "2026-02-20T17:01:00Z"),
+            _latency(1300, "2026-02-20T17:02:00Z"),
+            _latency(3000, "2026-02-20T17:10:00Z"),
+            _latency(2500, "2026-02-20T17:11:00Z"),
+            _latency(400, "2026-02-20T17:13:00Z"),
+        ],
+    )
+    settings = Settings(_env_file=None, latency_p95_threshold_ms=800, max_actions_per_incident=1)
+
+    result = replay(load_trace(trace), settings)
+
+    # 17:00 breach escalates twice, then a scale-up at 17:02 recovers it (120s);
+    # 17:10 breach keeps escalating until a healthy sample at 17:13 (180s).
+    assert result.breach_episodes == 2
+    assert result.episodes_recovered == 2
+    assert result.incidents == 5
+    assert result.mean_time_to_resolve_seconds == 150.0
+    assert result.max_time_to_resolve_seconds == 180.0
+
+
+def test_dense_burst_is_not_throttled(tmp_path) -> None:
+    start = datetime(2026, 2, 20, 17, 0, tzinfo=timezone.utc)
+    trace = _write_records(
+        tmp_path,
+        [_latency(100 + index, (start + timedelta(milliseconds=index)).isoformat()) for index in range(100)],
+    )
+
+    result = replay(load_trace(trace), Settings(_env_file=None, ingest_rate_per_second=20.0, ingest_burst=40))
+
+    assert result.events_replayed == 100
+    assert result.events_dropped == 0
+
+
+def test_invalid_vary_value_is_an_argument_error(tmp_path, capsys) -> None:
+    trace = _write_trace(tmp_path)
+
+    with pytest.raises(SystemExit) as exc_info:
+        main([trace, "--vary", "max_actions_per_incident=1,x"])
+
+    assert exc_info.value.code == 2
+    assert "invalid value 'x' for max_actions_per_incident" in capsys.readouterr().err